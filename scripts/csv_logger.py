@@ -1,21 +1,28 @@
 import csv
-import time
+import logging
 from datetime import datetime
 from pathlib import Path
-from venv import logger
 
 from gdrive_log import GDriveLogger
+from log_validator import (HEADERS, TIMESTAMP_FORMAT, LogValidator,
+                           default_backup_path, default_quarantine_path,
+                           record_to_row)
+
+logger = logging.getLogger(__name__)
 
 
 class CsvLogger:
-    HEADERS = ["timestamp", "logging_user", "event", "data"]
-    TIMESTAMP_FORMAT = "%H:%M:%S %Y-%m-%d"
+    HEADERS = HEADERS
+    TIMESTAMP_FORMAT = TIMESTAMP_FORMAT
 
     def __init__(self, file_path, remote=True):
         self.file_path = Path(file_path)
+        self.quarantine_path = default_quarantine_path(self.file_path)
 
-        if not self.file_path.exists():
-            self.set_headers()
+        self.records = []
+        self.load_error = None
+        self._file_state = None
+        self.refresh()
 
         if remote:
             self.remote_logger = GDriveLogger()
@@ -23,53 +30,91 @@ class CsvLogger:
             self.remote_logger = None
 
     def set_headers(self):
-        with open(self.file_path, mode="w", newline="") as file:
+        with open(self.file_path, mode="w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
             writer.writerow(self.HEADERS)
 
+    def _get_file_state(self):
+        stat = self.file_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """Reload records if the file was changed outside of this logger."""
+        if not self.file_path.exists() or self.file_path.stat().st_size == 0:
+            self.set_headers()
+
+        if self._get_file_state() != self._file_state:
+            self.records = self.ingest()
+            self._file_state = self._get_file_state()
+
+    def ingest(self):
+        """Load clean records, repairing the file and quarantining malformed rows."""
+        validator = LogValidator(self.quarantine_path)
+        records = []
+        try:
+            validator.clean_file(self.file_path, records=records)
+        except ValueError as e:
+            # leave the file untouched so that it can be fixed by hand; no new
+            # entries are logged until then:
+            logger.error(f"Could not load {self.file_path}: {e}")
+            self.load_error = str(e)
+            return []
+        self.load_error = None
+        if validator.n_changed:
+            logger.warning(
+                f"Cleaned {self.file_path}: {validator.n_repaired} rows repaired, "
+                f"{validator.n_quarantined} rows moved to {self.quarantine_path}"
+            )
+        return records
+
     def log(self, event_dict: dict, timestamp=None):
+        """Append an event to the log.
+
+        Return False if the event was quarantined instead, or if the log file could
+        not be loaded.
+        """
+        # load any hand edit first, so that records match the file we append to:
+        self.refresh()
+        if self.load_error:
+            logger.error(f"Not logging {event_dict}: {self.load_error}")
+            return False
+
         if not timestamp:
             timestamp = datetime.now()
-        data = [
+        values = [
             timestamp.strftime(self.TIMESTAMP_FORMAT),
             event_dict["logging_user"],
             event_dict["event"],
             event_dict["data"],
         ]
 
-        with open(self.file_path, mode="a", newline="") as file:
+        record = LogValidator(self.quarantine_path).check_row(values)
+        if record is None:
+            return False
+
+        with open(self.file_path, mode="a", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
-            writer.writerow(data)
+            writer.writerow(record_to_row(record))
+        self.records.append(record)
+        self._file_state = self._get_file_state()
+        return True
 
     @property
     def reader(self):
-        with open(self.file_path, mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                yield row
+        # records are validated on ingest and on log, so they are always clean:
+        self.refresh()
+        yield from self.records
 
     def get_last_occurrences(self):
         last_occurrences = {}
-        # iterate over reversed rows to get last occurrences.
         # To decide what is last, using timestamp as order could be non-chonological:
-        for row in list(self.reader):
-            if row["event"] not in last_occurrences:
-                add_row = True
-            else:
-                try:
-                    timedelta = datetime.strptime(
-                        row["timestamp"], self.TIMESTAMP_FORMAT
-                    ) - datetime.strptime(
-                        last_occurrences[row["event"]][0], self.TIMESTAMP_FORMAT
-                    )
-                    add_row = timedelta.total_seconds() > 0
-                except Exception as e:
-                    logger.error(f"Error in row when computing logging: {row}: {e}")
-                    add_row = False
-
-            if add_row:
+        for row in self.reader:
+            if (
+                row["event"] not in last_occurrences
+                or row["datetime"] > last_occurrences[row["event"]][0]
+            ):
                 last_occurrences[row["event"]] = (
-                    row["timestamp"],
+                    row["datetime"],
                     row["data"],
                     row["logging_user"],
                 )
@@ -77,15 +122,11 @@ class CsvLogger:
         return last_occurrences
 
     def _make_line(self, event, timestamp, data, logging_user, time_elapsed=True):
-        time_since_last = datetime.now() - datetime.strptime(
-            timestamp, self.TIMESTAMP_FORMAT
-        )
+        time_since_last = datetime.now() - timestamp
         minutes_since_last = time_since_last.total_seconds() // 60
         h, min = divmod(minutes_since_last, 60)
         # make timestamp with only hours and minutes:
-        timestamp = datetime.strptime(timestamp, self.TIMESTAMP_FORMAT).strftime(
-            "%H:%M"
-        )
+        timestamp = timestamp.strftime("%H:%M")
         if time_elapsed:
             time_string = f"{int(h)}h {int(min)}m ago ({timestamp})"
         else:
@@ -115,9 +156,10 @@ class CsvLogger:
 
     def get_daily_counts(self):
         daily_counts = {}
+        today = datetime.now().date()
         for row in self.reader:
             # check if day is current one
-            if datetime.now().strftime("%Y-%m-%d") not in row["timestamp"]:
+            if row["datetime"].date() != today:
                 continue
             # esclude comments:
             if row["event"] in [
@@ -142,20 +184,16 @@ class CsvLogger:
 
     def format_all_rows(self):
         mex = f"```\nAll entries:\n\n"
-        row_list = []
-        for row in self.reader:
-            try:
-                row_list.append(
-                    self._make_line(
-                        row["event"],
-                        row["timestamp"],
-                        row["data"],
-                        row["logging_user"],
-                        time_elapsed=False,
-                    )
-                )
-            except Exception as e:
-                logger.error(f"Error in row: {row} - {e}")
+        row_list = [
+            self._make_line(
+                row["event"],
+                row["datetime"],
+                row["data"],
+                row["logging_user"],
+                time_elapsed=False,
+            )
+            for row in self.reader
+        ]
         mex += "\n".join(row_list)
         mex += "\n ```\n"
         return mex
@@ -173,22 +211,12 @@ class CsvLogger:
 
     def backup(self):
 
-        backup_folder = self.file_path.parent / "backups"
-        backup_folder.mkdir(parents=True, exist_ok=True)
-
-        # backup file with new filename that keeps track of backup datetime:
-        backup_filename = (
-            self.file_path.stem
-            + "_backup_"
-            + datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            + self.file_path.suffix
-        )
-
-        backup_file_path = backup_folder / backup_filename
+        backup_file_path = default_backup_path(self.file_path)
+        backup_file_path.parent.mkdir(parents=True, exist_ok=True)
 
         # copy file to backup path:
-        with open(self.file_path, "r") as file:
-            with open(backup_file_path, "w") as backup_file:
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            with open(backup_file_path, "w", encoding="utf-8") as backup_file:
                 backup_file.write(file.read())
 
         if self.remote_logger:
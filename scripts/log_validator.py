@@ -0,0 +1,238 @@
+import argparse
+import csv
+import logging
+import os
+import re
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HEADERS = ["timestamp", "logging_user", "event", "data"]
+TIMESTAMP_FORMAT = "%H:%M:%S %Y-%m-%d"
+QUARANTINE_HEADERS = HEADERS + ["error"]
+# full ISO date-times only: a date alone cannot be repaired into a log entry:
+ISO_DATETIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+
+def default_quarantine_path(file_path):
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.stem + "_quarantine" + file_path.suffix)
+
+
+def default_backup_path(file_path):
+    # backup file with new filename that keeps track of backup datetime:
+    file_path = Path(file_path)
+    backup_filename = (
+        file_path.stem
+        + "_backup_"
+        + datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        + file_path.suffix
+    )
+    return file_path.parent / "backups" / backup_filename
+
+
+def normalize_field(value):
+    # embedded newlines would break the one-line-per-entry messages:
+    if value is None:
+        return ""
+    return " ".join(str(value).splitlines()).strip()
+
+
+def parse_timestamp(timestamp):
+    try:
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    except ValueError:
+        pass
+    # repair timestamps saved in ISO format (e.g. by editing the file by hand):
+    if not ISO_DATETIME_PATTERN.match(timestamp):
+        raise ValueError(f"invalid timestamp {timestamp!r}")
+    try:
+        parsed = datetime.fromisoformat(timestamp).replace(microsecond=0)
+    except ValueError:
+        raise ValueError(f"invalid timestamp {timestamp!r}") from None
+    # the log stores naive local times, so convert timestamps with an offset:
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def make_record(timestamp, logging_user, event, data):
+    """Build a clean record from already normalized values."""
+    return {
+        "timestamp": timestamp.strftime(TIMESTAMP_FORMAT),
+        "logging_user": logging_user,
+        "event": event,
+        "data": data,
+        "datetime": timestamp,
+    }
+
+
+def record_to_row(record):
+    return [record[header] for header in HEADERS]
+
+
+class LogValidator:
+    """Validate and normalize log rows, sending unrepairable ones to a quarantine file.
+
+    Rows are processed one at a time so that large files are never loaded in memory.
+    """
+
+    def __init__(self, quarantine_path=None):
+        self.quarantine_path = Path(quarantine_path) if quarantine_path else None
+        self.n_valid = 0
+        self.n_repaired = 0
+        self.n_quarantined = 0
+
+    @property
+    def n_changed(self):
+        return self.n_repaired + self.n_quarantined
+
+    def validate_row(self, values):
+        """Return a clean record from a list of raw values, or raise ValueError."""
+        values = list(values)
+        # a missing trailing data column can be safely filled in:
+        if len(values) == len(HEADERS) - 1:
+            values.append("")
+        if len(values) != len(HEADERS):
+            raise ValueError(f"expected {len(HEADERS)} fields, got {len(values)}")
+
+        timestamp, logging_user, event, data = [normalize_field(v) for v in values]
+        if not event:
+            raise ValueError("missing event")
+        if not logging_user:
+            raise ValueError("missing logging_user")
+
+        return make_record(parse_timestamp(timestamp), logging_user, event, data)
+
+    def check_row(self, values):
+        """Validate a row, updating counters; return None if the row was quarantined."""
+        try:
+            record = self.validate_row(values)
+        except ValueError as e:
+            self.quarantine(values, e)
+            return None
+
+        if record_to_row(record) != list(values):
+            self.n_repaired += 1
+        else:
+            self.n_valid += 1
+        return record
+
+    def quarantine(self, values, error):
+        self.n_quarantined += 1
+        logger.warning(f"Quarantining malformed row {values}: {error}")
+        if self.quarantine_path is None:
+            return
+
+        write_headers = not self.quarantine_path.exists()
+        with open(self.quarantine_path, mode="a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if write_headers:
+                writer.writerow(QUARANTINE_HEADERS)
+            writer.writerow(list(values) + [str(error)])
+
+    def iter_file(self, file_path):
+        """Yield clean records from a log file, quarantining malformed rows."""
+        try:
+            # utf-8-sig drops the BOM that some spreadsheet editors add:
+            with open(file_path, mode="r", newline="", encoding="utf-8-sig") as file:
+                # strict mode makes an unbalanced quote an error, instead of
+                # silently merging all the following rows into a single field:
+                reader = csv.reader(file, strict=True)
+                headers = next(reader, None)
+                # an empty file has no rows to validate:
+                if headers is None:
+                    return
+                if headers != HEADERS:
+                    raise ValueError(
+                        f"Unexpected headers in {file_path}: {headers} "
+                        f"(expected {HEADERS})"
+                    )
+                for values in reader:
+                    # skip blank lines:
+                    if not values:
+                        continue
+                    record = self.check_row(values)
+                    if record is not None:
+                        yield record
+        except csv.Error as e:
+            # the file cannot be split into rows, so no row can be trusted:
+            raise ValueError(f"Could not parse {file_path}: {e}") from e
+
+    def clean_file(self, file_path, output_path=None, records=None):
+        """Stream a log file through the validator, writing clean rows to output_path.
+
+        If output_path is None the file is rewritten in place, but only if some row
+        had to be repaired or quarantined; the original is copied to the backups
+        folder first. Clean records are appended to the records
+        list if one is given, otherwise they are not kept in memory.
+        """
+        file_path = Path(file_path)
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
+        try:
+            with open(tmp_path, mode="w", newline="", encoding="utf-8") as tmp_file:
+                writer = csv.writer(tmp_file)
+                writer.writerow(HEADERS)
+                for record in self.iter_file(file_path):
+                    writer.writerow(record_to_row(record))
+                    if records is not None:
+                        records.append(record)
+
+            if output_path is not None:
+                os.replace(tmp_path, output_path)
+            elif self.n_changed:
+                backup_path = default_backup_path(file_path)
+                backup_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(file_path, backup_path)
+                logger.info(f"Original {file_path} copied to {backup_path}")
+                os.replace(tmp_path, file_path)
+        finally:
+            # nothing left to clean if the temporary file replaced the output:
+            tmp_path.unlink(missing_ok=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Validate a baby log CSV file, quarantining malformed rows."
+    )
+    parser.add_argument("file_path", type=Path, help="log file to check")
+    parser.add_argument(
+        "-q",
+        "--quarantine",
+        type=Path,
+        default=None,
+        help="where to write malformed rows (default: <file>_quarantine.csv)",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="rewrite the file in place with repaired rows only",
+    )
+    args = parser.parse_args(argv)
+
+    quarantine_path = args.quarantine or default_quarantine_path(args.file_path)
+    validator = LogValidator(quarantine_path if args.fix else args.quarantine)
+
+    try:
+        if args.fix:
+            validator.clean_file(args.file_path)
+        else:
+            # only count, without keeping records in memory:
+            for _ in validator.iter_file(args.file_path):
+                pass
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    print(
+        f"{args.file_path}: {validator.n_valid} valid, "
+        f"{validator.n_repaired} repaired, {validator.n_quarantined} malformed"
+    )
+    return 1 if validator.n_quarantined else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -126,8 +126,12 @@ async def button(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             "logging_user": ALLOWED_USERS[user_id],
         }
 
-        csv_logger.log(data_dict)
-        await query.edit_message_text(text=f"Logged: {data}")
+        if csv_logger.log(data_dict):
+            await query.edit_message_text(text=f"Logged: {data}")
+        else:
+            await query.edit_message_text(
+                text=f"Could not log {data}, check the bot logs."
+            )
 
     if not reading_weight_flag:
         await query.message.reply_text(
@@ -150,18 +154,24 @@ async def comment(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             "data": update.message.text,
             "logging_user": ALLOWED_USERS[user_id],
         }
-        csv_logger.log(data_dict)
-
-        await update.message.reply_text("Comment logged.")
+        if csv_logger.log(data_dict):
+            await update.message.reply_text("Comment logged.")
+        else:
+            await update.message.reply_text(
+                "Could not log comment, check the bot logs."
+            )
     else:
         data_dict = {
             "event": "weight",
             "data": update.message.text,
             "logging_user": ALLOWED_USERS[user_id],
         }
-        csv_logger.log(data_dict)
-
-        await update.message.reply_text("Weight logged.")
+        if csv_logger.log(data_dict):
+            await update.message.reply_text("Weight logged.")
+        else:
+            await update.message.reply_text(
+                "Could not log weight, check the bot logs."
+            )
         reading_weight_flag = False
 
     await update.message.reply_text(
@@ -250,10 +260,14 @@ async def add_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             else "",
             "logging_user": ALLOWED_USERS[update.message.from_user.id],
         }
-        csv_logger.log(data_dict, timestamp=timestamp)
-        await context.bot.sendMessage(
-            chat_id, f"Logged: {data} at {timestamp.strftime('%H:%M')}."
-        )
+        if csv_logger.log(data_dict, timestamp=timestamp):
+            await context.bot.sendMessage(
+                chat_id, f"Logged: {data} at {timestamp.strftime('%H:%M')}."
+            )
+        else:
+            await context.bot.sendMessage(
+                chat_id, f"Could not log {mex}, check the bot logs."
+            )
 
     await update.message.reply_text(
         f"Log Greg status:", reply_markup=InlineKeyboardMarkup(main_keyboard)
@@ -0,0 +1,11 @@
+import sys
+import types
+from pathlib import Path
+
+# the bot modules live in scripts/ and import each other as top-level modules:
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+# gdrive_log needs Google credentials at import time; tests only use remote=False:
+gdrive_log = types.ModuleType("gdrive_log")
+gdrive_log.GDriveLogger = None
+sys.modules.setdefault("gdrive_log", gdrive_log)
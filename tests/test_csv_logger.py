@@ -0,0 +1,118 @@
+import csv
+from datetime import datetime, timedelta
+
+from csv_logger import CsvLogger
+from log_validator import HEADERS, TIMESTAMP_FORMAT, default_quarantine_path
+
+
+def _write_log(path, rows, headers=HEADERS):
+    with open(path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _read_rows(path):
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        return list(csv.reader(file))
+
+
+def _event(event, data="", logging_user="a"):
+    return {"logging_user": logging_user, "event": event, "data": data}
+
+
+def test_empty_file_gets_headers(tmp_path):
+    log_path = tmp_path / "log.csv"
+    log_path.write_text("")
+
+    csv_logger = CsvLogger(log_path, remote=False)
+
+    assert csv_logger.records == []
+    assert _read_rows(log_path) == [HEADERS]
+
+
+def test_log_normalizes_and_appends(tmp_path):
+    log_path = tmp_path / "log.csv"
+    csv_logger = CsvLogger(log_path, remote=False)
+    timestamp = datetime(2026, 10, 19, 10, 0)
+
+    assert csv_logger.log(_event("waking_up", "A\n"), timestamp=timestamp)
+
+    assert _read_rows(log_path)[1] == ["10:00:00 2026-10-19", "a", "waking_up", "A"]
+    (line,) = [l for l in csv_logger.format_all_rows().splitlines() if " - " in l]
+    assert line.split() == ["-", "waking_up", "(A):", "a", "(10:00)"]
+
+
+def test_log_quarantines_malformed_event(tmp_path):
+    log_path = tmp_path / "log.csv"
+    csv_logger = CsvLogger(log_path, remote=False)
+
+    assert not csv_logger.log(_event(""))
+
+    assert csv_logger.records == []
+    assert _read_rows(log_path) == [HEADERS]
+    quarantined = _read_rows(default_quarantine_path(log_path))
+    assert quarantined[1][-1] == "missing event"
+
+
+def test_refresh_loads_hand_edits(tmp_path):
+    log_path = tmp_path / "log.csv"
+    csv_logger = CsvLogger(log_path, remote=False)
+    csv_logger.log(_event("feeding", "sx"), timestamp=datetime(2026, 10, 19, 10, 0))
+
+    with open(log_path, mode="a", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerow(["2026-10-19T11:00:00", "b", "pooping", ""])
+
+    assert [row["event"] for row in csv_logger.reader] == ["feeding", "pooping"]
+    # the hand edit is repaired in the file too:
+    assert _read_rows(log_path)[2] == ["11:00:00 2026-10-19", "b", "pooping", ""]
+
+
+def test_log_refused_while_file_cannot_be_loaded(tmp_path):
+    log_path = tmp_path / "log.csv"
+    _write_log(log_path, [["10:00:00 2026-10-19", "a", "feeding"]], headers=["foo"])
+    content = log_path.read_text()
+
+    csv_logger = CsvLogger(log_path, remote=False)
+
+    assert csv_logger.load_error
+    assert not csv_logger.log(_event("feeding", "sx"))
+    assert log_path.read_text() == content
+
+    # once the file is fixed by hand, logging works again:
+    _write_log(log_path, [["10:00:00 2026-10-19", "a", "feeding", "sx"]])
+    assert csv_logger.log(_event("feeding", "dx"))
+    assert csv_logger.load_error is None
+    assert len(csv_logger.records) == 2
+
+
+def test_last_occurrences_use_most_recent_timestamp(tmp_path):
+    log_path = tmp_path / "log.csv"
+    _write_log(
+        log_path,
+        [
+            ["10:00:00 2026-10-19", "a", "feeding", "sx"],
+            ["09:00:00 2026-10-19", "b", "feeding", "dx"],
+        ],
+    )
+
+    last_occurrences = CsvLogger(log_path, remote=False).get_last_occurrences()
+
+    assert last_occurrences == {"feeding": (datetime(2026, 10, 19, 10, 0), "sx", "a")}
+
+
+def test_daily_counts_only_count_today(tmp_path):
+    log_path = tmp_path / "log.csv"
+    now = datetime.now()
+    yesterday = now - timedelta(days=1)
+    _write_log(
+        log_path,
+        [
+            [now.strftime(TIMESTAMP_FORMAT), "a", "feeding", "sx"],
+            [now.strftime(TIMESTAMP_FORMAT), "a", "feeding", "dx"],
+            [now.strftime(TIMESTAMP_FORMAT), "a", "comment", "hi"],
+            [yesterday.strftime(TIMESTAMP_FORMAT), "a", "pooping", ""],
+        ],
+    )
+
+    assert CsvLogger(log_path, remote=False).get_daily_counts() == {"feeding": 2}
@@ -0,0 +1,188 @@
+import csv
+from datetime import datetime
+
+import pytest
+from log_validator import (HEADERS, TIMESTAMP_FORMAT, LogValidator,
+                           default_quarantine_path, main, parse_timestamp)
+
+VALID_ROW = ["10:00:00 2026-10-19", "a", "feeding", "sx"]
+
+
+def _write_log(path, rows, headers=HEADERS):
+    with open(path, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _read_rows(path):
+    with open(path, mode="r", newline="") as file:
+        return list(csv.reader(file))
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (VALID_ROW, VALID_ROW),
+        (
+            ["10:00:00 2026-10-19", "a", "waking_up", "A\n"],
+            ["10:00:00 2026-10-19", "a", "waking_up", "A"],
+        ),
+        (["2026-10-19T10:00:00", "a", "feeding", "sx"], VALID_ROW),
+        (
+            ["10:00:00 2026-10-19", "a", "pooping"],
+            ["10:00:00 2026-10-19", "a", "pooping", ""],
+        ),
+    ],
+)
+def test_validate_row_repairs(values, expected):
+    record = LogValidator().validate_row(values)
+    assert [record[h] for h in HEADERS] == expected
+    assert record["datetime"] == datetime.strptime(expected[0], TIMESTAMP_FORMAT)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["garbage", "a", "peeing", ""],
+        ["2026-10-19", "a", "peeing", ""],
+        ["20261019", "a", "peeing", ""],
+        ["2026-10-19T25:00", "a", "peeing", ""],
+        ["10:00:00 2026-10-19", "a", "feeding", "sx", "extra"],
+        ["10:00:00 2026-10-19", "a"],
+        ["10:00:00 2026-10-19", "a", "", "sx"],
+    ],
+)
+def test_malformed_rows_are_quarantined(tmp_path, values):
+    quarantine_path = tmp_path / "quarantine.csv"
+    validator = LogValidator(quarantine_path)
+
+    assert validator.check_row(values) is None
+    assert validator.n_quarantined == 1
+    rows = _read_rows(quarantine_path)
+    assert rows[0] == HEADERS + ["error"]
+    assert rows[1][: len(values)] == values
+
+
+def test_aware_iso_timestamp_is_converted_to_naive_local_time():
+    parsed = parse_timestamp("2026-10-18T11:00:00+02:00")
+    assert parsed.tzinfo is None
+    expected = datetime.fromisoformat("2026-10-18T11:00:00+02:00").astimezone()
+    assert parsed == expected.replace(tzinfo=None)
+
+
+def test_clean_file_rewrites_only_when_changed(tmp_path):
+    log_path = tmp_path / "log.csv"
+    _write_log(log_path, [VALID_ROW])
+    mtime = log_path.stat().st_mtime_ns
+
+    records = []
+    validator = LogValidator(default_quarantine_path(log_path))
+    validator.clean_file(log_path, records=records)
+
+    assert validator.n_changed == 0
+    assert log_path.stat().st_mtime_ns == mtime
+    assert len(records) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["log.csv"]
+
+
+def test_clean_file_rewrites_in_place(tmp_path):
+    log_path = tmp_path / "log.csv"
+    _write_log(
+        log_path,
+        [VALID_ROW, ["2026-10-19T11:00:00", "b", "pooping"], ["bad", "a", "x", ""]],
+    )
+
+    validator = LogValidator(default_quarantine_path(log_path))
+    validator.clean_file(log_path)
+
+    assert validator.n_valid == 1
+    assert validator.n_repaired == 1
+    assert validator.n_quarantined == 1
+    assert _read_rows(log_path) == [
+        HEADERS,
+        VALID_ROW,
+        ["11:00:00 2026-10-19", "b", "pooping", ""],
+    ]
+    assert len(_read_rows(default_quarantine_path(log_path))) == 2
+    # the original file is kept aside before being rewritten:
+    (backup_path,) = (tmp_path / "backups").iterdir()
+    assert len(_read_rows(backup_path)) == 4
+
+
+def test_unbalanced_quote_does_not_merge_rows(tmp_path):
+    log_path = tmp_path / "log.csv"
+    content = (
+        ",".join(HEADERS)
+        + '\n10:00:00 2026-10-19,a,comment,"he said hi\n'
+        + ",".join(VALID_ROW)
+        + "\n"
+    )
+    log_path.write_text(content)
+
+    with pytest.raises(ValueError, match="unexpected end of data"):
+        LogValidator().clean_file(log_path)
+    assert log_path.read_text() == content
+
+
+def test_empty_and_bom_files(tmp_path):
+    empty_path = tmp_path / "empty.csv"
+    empty_path.write_text("")
+    assert list(LogValidator().iter_file(empty_path)) == []
+
+    bom_path = tmp_path / "bom.csv"
+    lines = [",".join(HEADERS), ",".join(VALID_ROW)]
+    bom_path.write_text("\ufeff" + "\n".join(lines) + "\n")
+    assert len(list(LogValidator().iter_file(bom_path))) == 1
+
+
+def test_bad_headers_leave_no_temporary_file(tmp_path):
+    log_path = tmp_path / "log.csv"
+    _write_log(log_path, [VALID_ROW], headers=["foo", "bar"])
+
+    with pytest.raises(ValueError):
+        LogValidator().clean_file(log_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["log.csv"]
+
+
+def test_cli_exit_codes(tmp_path, capsys):
+    log_path = tmp_path / "log.csv"
+    _write_log(log_path, [VALID_ROW])
+    assert main([str(log_path)]) == 0
+
+    _write_log(log_path, [VALID_ROW, ["bad", "a", "x", ""]])
+    assert main([str(log_path)]) == 1
+    # check mode does not touch the file or write a quarantine:
+    assert len(_read_rows(log_path)) == 3
+    assert not default_quarantine_path(log_path).exists()
+
+    assert main([str(log_path), "--fix"]) == 1
+    assert len(_read_rows(log_path)) == 2
+    assert main([str(log_path)]) == 0
+
+    _write_log(log_path, [VALID_ROW], headers=["foo", "bar"])
+    assert main([str(log_path)]) == 2
+    assert "Unexpected headers" in capsys.readouterr().err
+
+
+def test_unparsable_file_raises_value_error(tmp_path):
+    log_path = tmp_path / "log.csv"
+    _write_log(log_path, [VALID_ROW[:3] + ["x" * (csv.field_size_limit() + 1)]])
+
+    with pytest.raises(ValueError, match="field larger than field limit"):
+        LogValidator().clean_file(log_path)
+    assert main([str(log_path)]) == 2
+
+
+def test_files_are_written_as_utf8(tmp_path):
+    log_path = tmp_path / "log.csv"
+    rows = [["10:00:00 2026-10-19", "a", "comment", "caffè\n"], ["bad", "à", "x", ""]]
+    with open(log_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+    LogValidator(default_quarantine_path(log_path)).clean_file(log_path)
+
+    assert "caffè" in log_path.read_bytes().decode("utf-8")
+    assert "à" in default_quarantine_path(log_path).read_bytes().decode("utf-8")